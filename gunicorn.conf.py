@@ -0,0 +1,10 @@
+import os
+
+# Load the app once in the master before forking. The scheduler and the
+# startup warm-up then run only in the master: scheduler threads aren't
+# carried across fork, so workers just serve requests from the shared cache.
+preload_app = True
+
+workers = int(os.getenv('WEB_CONCURRENCY', 2))
+worker_class = 'gthread'
+threads = int(os.getenv('GUNICORN_THREADS', 4))
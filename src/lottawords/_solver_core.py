@@ -0,0 +1,403 @@
+"""
+Integer kernels behind the Letter Boxed solver.
+
+Letters are handled as indexes 0-25 and sets of letters as 26-bit masks
+(bit i means chr(97 + i) is present), so the hot loops here only touch
+ints and bytes.
+"""
+import re
+from array import array
+from functools import lru_cache
+from heapq import nlargest
+from typing import Dict, Iterable, List, Optional, Pattern, Sequence, Tuple
+
+# Side table value for bytes that are not letters of the puzzle
+NO_SIDE = 0xFF
+
+# Popcount of every 13-bit value; a 26-letter mask is covered by two lookups
+_POPCOUNT_13 = bytes(bin(value).count('1') for value in range(1 << 13))
+
+
+# Largest number of two-word chains build_suffix_table will enumerate
+MAX_SUFFIX_PAIRS = 250000
+
+# Search stack entries: bits 0-25 letters used, 26-30 path length, 31 exit
+# flag and 32-63 the index of the word that ends the path
+_ENTRY_MASK_BITS = (1 << 26) - 1
+_ENTRY_LENGTH_SHIFT = 26
+_ENTRY_LENGTH_BITS = 0x1F
+_ENTRY_EXIT_FLAG = 1 << 31
+_ENTRY_WORD_SHIFT = 32
+
+
+def popcount(mask: int) -> int:
+    """Count the letters set in a 26-bit letter mask."""
+    return _POPCOUNT_13[mask & 0x1FFF] + _POPCOUNT_13[mask >> 13]
+
+
+def letter_mask(word_bytes: bytes) -> int:
+    """Convert lowercase ASCII letters to a letter mask."""
+    mask = 0
+    for byte in word_bytes:
+        mask |= 1 << (byte - 97)
+    return mask
+
+
+@lru_cache(maxsize=16)
+def build_side_table(sides: Tuple[Tuple[str, ...], ...]) -> bytes:
+    """
+    Build a 256-entry table mapping each byte to the index (0-3) of the side
+    its letter is on, or NO_SIDE if the letter is not in the square.
+    """
+    side_table = bytearray([NO_SIDE]) * 256
+    for side_index, letters in enumerate(sides):
+        for letter in letters:
+            side_table[ord(letter.lower())] = side_index
+    return bytes(side_table)
+
+
+def side_table_mask(side_table: bytes) -> int:
+    """Letter mask of the lowercase letters present in a side table."""
+    mask = 0
+    for letter_index in range(26):
+        if side_table[97 + letter_index] != NO_SIDE:
+            mask |= 1 << letter_index
+    return mask
+
+
+def is_valid_bytes(word_bytes: bytes, side_table: bytes) -> bool:
+    """Check a lowercase ASCII word against a 256-entry letter -> side table."""
+    prev_side = NO_SIDE
+    for byte in word_bytes:
+        side = side_table[byte]
+        if side == NO_SIDE or side == prev_side:
+            return False
+        prev_side = side
+    return True
+
+
+def _filter_playable_words(words: Iterable[str], side_table: bytes) -> Tuple[List[bytes], Dict[bytes, str]]:
+    """Word-by-word filter_playable, for dictionaries that can't be joined into lines."""
+    puzzle_letters = bytes(byte for byte in range(256) if side_table[byte] != NO_SIDE)
+    playable_words = []
+    original_case = {}
+    
+    for word in words:
+        if not word:
+            continue
+        
+        word_lower = word.lower()
+        try:
+            word_bytes = word_lower.encode('ascii')
+        except UnicodeEncodeError:
+            continue
+        
+        # Anything left after deleting the puzzle letters can't be played
+        if word_bytes.translate(None, puzzle_letters):
+            continue
+        
+        if is_valid_bytes(word_bytes, side_table):
+            playable_words.append(word_bytes)
+            original_case[word_bytes] = word
+    
+    return playable_words, original_case
+
+
+@lru_cache(maxsize=16)
+def compile_square(side_table: bytes) -> Optional[Tuple[Pattern, Pattern]]:
+    """
+    Compile the regexes that check words against one square.
+    
+    The puzzle's letters and sides are baked into the patterns as literal
+    character classes, so they are built once per square and reused.
+    
+    Returns:
+        (candidate_pattern, playable_pattern), or None if the square has no letters.
+        candidate_pattern matches, in multiline mode, lines made only of puzzle
+        letters; playable_pattern fully matches words that never take two letters
+        in a row from one side. Both ignore ASCII case.
+    """
+    sides = {}
+    for byte in range(128):
+        if side_table[byte] != NO_SIDE:
+            sides.setdefault(side_table[byte], []).append(re.escape(bytes([byte])))
+    if not sides:
+        return None
+    
+    letters = b''.join(b''.join(chars) for chars in sides.values())
+    candidate_pattern = re.compile(b'^[%s]+$' % letters, re.MULTILINE | re.IGNORECASE)
+    playable_pattern = re.compile(
+        b'(?:%s)+' % b'|'.join(b'[%s](?![%s])' % (b''.join(chars), b''.join(chars))
+                               for chars in sides.values()),
+        re.IGNORECASE
+    )
+    return candidate_pattern, playable_pattern
+
+
+def filter_playable(words: Sequence[str], side_table: bytes) -> Tuple[List[bytes], Dict[bytes, str]]:
+    """
+    Keep the words that can be played on the square described by side_table.
+    
+    The dictionary is scanned as one newline-joined string with the patterns
+    from compile_square: candidates first, then the side rule on each of them.
+    
+    Returns:
+        (playable_words, original_case): playable words as lowercase ASCII bytes in
+        input order, and a map from each of them back to the spelling it had in words
+    """
+    patterns = compile_square(side_table)
+    if patterns is None:
+        return [], {}
+    candidate_pattern, playable_pattern = patterns
+    
+    text = '\n'.join(words)
+    if text.count('\n') != len(words) - 1:
+        # A word spans lines, so lines no longer map to words
+        return _filter_playable_words(words, side_table)
+    
+    # Non-ASCII characters become '?', which no pattern accepts
+    text_bytes = text.encode('ascii', 'replace')
+    
+    playable_words = []
+    original_case = {}
+    for word in candidate_pattern.findall(text_bytes):
+        if playable_pattern.fullmatch(word):
+            word_lower = word.lower()
+            playable_words.append(word_lower)
+            original_case[word_lower] = word.decode('ascii')
+    
+    return playable_words, original_case
+
+
+def drop_dominated(words: Sequence[bytes]) -> List[bytes]:
+    """
+    Drop words another word makes redundant in a solution.
+    
+    A word is dominated by another with the same first and last letter whose
+    letters are a superset of its own: swapping one for the other keeps every
+    chain valid and covers at least as much. Among words with identical letter
+    sets only the first is kept. Survivors stay in their original order.
+    """
+    groups = {}
+    for position, word in enumerate(words):
+        groups.setdefault((word[0], word[-1]), []).append((letter_mask(word), position))
+    
+    kept_positions = []
+    for entries in groups.values():
+        # Visit larger letter sets first so every dominator is kept before
+        # the words it covers; the stable sort keeps the earliest of equals
+        entries.sort(key=lambda entry: -popcount(entry[0]))
+        kept_masks = []
+        for mask, position in entries:
+            if any(mask & ~kept == 0 for kept in kept_masks):
+                continue
+            kept_masks.append(mask)
+            kept_positions.append(position)
+    
+    kept_positions.sort()
+    return [words[position] for position in kept_positions]
+
+
+def build_successor_table(word_starts: bytes) -> Tuple[array, array]:
+    """
+    Group word indexes by first letter in CSR form.
+    
+    Returns:
+        (offsets, successor_words): the words starting with letter index i are
+        successor_words[offsets[i]:offsets[i + 1]], kept in their original order
+    """
+    offsets = array('i', [0] * 27)
+    for letter_index in word_starts:
+        offsets[letter_index + 1] += 1
+    for letter_index in range(26):
+        offsets[letter_index + 1] += offsets[letter_index]
+    
+    successor_words = array('i', sorted(range(len(word_starts)), key=word_starts.__getitem__))
+    return offsets, successor_words
+
+
+def find_short_solution(word_masks: Sequence[int], word_ends: bytes, offsets: Sequence[int],
+                        successor_words: array, puzzle_mask: int) -> Optional[List[int]]:
+    """
+    Exhaustively look for a one- or two-word solution.
+    
+    Words are tried in their original order and the first solution wins, so
+    ties go the same way as in search_shortest.
+    
+    Returns:
+        Word indexes of the solution, or None if it takes three words or more
+    """
+    for index, mask in enumerate(word_masks):
+        if mask == puzzle_mask:
+            return [index]
+    
+    successor_masks = [word_masks[index] for index in successor_words]
+    
+    # Letters reachable by some word starting with each letter, and the most
+    # letters any one of those words has
+    reachable = [0] * 26
+    max_coverage = [0] * 26
+    for letter_index in range(26):
+        for mask in successor_masks[offsets[letter_index]:offsets[letter_index + 1]]:
+            reachable[letter_index] |= mask
+            max_coverage[letter_index] = max(max_coverage[letter_index], popcount(mask))
+    
+    for first_index, first_mask in enumerate(word_masks):
+        missing = puzzle_mask & ~first_mask
+        last_letter = word_ends[first_index]
+        if missing & ~reachable[last_letter] or popcount(missing) > max_coverage[last_letter]:
+            continue
+        for position in range(offsets[last_letter], offsets[last_letter + 1]):
+            if successor_masks[position] & missing == missing:
+                return [first_index, successor_words[position]]
+    
+    return None
+
+
+def build_suffix_table(word_masks: Sequence[int], word_ends: bytes, offsets: Sequence[int],
+                       successor_words: array) -> Optional[List[Dict[int, Tuple[int, int]]]]:
+    """
+    Build the backward half of a meet-in-the-middle search: for each letter index,
+    the distinct letter masks two chained words starting with it can cover, each
+    mapped to the first pair of word indexes that covers it.
+    
+    Returns:
+        The table, or None if it would hold more than MAX_SUFFIX_PAIRS pairs
+    """
+    pair_count = sum(offsets[end + 1] - offsets[end] for end in word_ends)
+    if pair_count > MAX_SUFFIX_PAIRS:
+        return None
+    
+    suffixes = [{} for _ in range(26)]
+    for letter_index in range(26):
+        table = suffixes[letter_index]
+        for first in successor_words[offsets[letter_index]:offsets[letter_index + 1]]:
+            first_mask = word_masks[first]
+            end = word_ends[first]
+            for second in successor_words[offsets[end]:offsets[end + 1]]:
+                mask = first_mask | word_masks[second]
+                if mask not in table:
+                    table[mask] = (first, second)
+    return suffixes
+
+
+def search_shortest(word_masks: Sequence[int], word_ends: bytes, offsets: Sequence[int],
+                    successor_words: array, puzzle_mask: int,
+                    max_length: int, max_iterations: int) -> Optional[List[int]]:
+    """
+    Find the fewest chained words covering puzzle_mask by iterative deepening.
+    
+    Args:
+        word_masks: Letter mask of each word
+        word_ends: Index of the last letter of each word
+        offsets, successor_words: Words by first letter from build_successor_table,
+            in the order ties should be broken
+        puzzle_mask: Letter mask of the whole puzzle
+        max_length: Longest solution to look for
+        max_iterations: Cap on the number of states expanded
+    
+    Returns:
+        Word indexes of the solution, or None if none was found within the limits
+    """
+    if not word_masks:
+        return None
+    
+    # Most puzzles have a one- or two-word answer, which a direct sweep finds
+    # without branch limits
+    solution = find_short_solution(word_masks, word_ends, offsets, successor_words, puzzle_mask)
+    if solution or max_length <= 2:
+        return solution
+    
+    # No word adds more letters than the best single word, which gives an
+    # admissible lower bound on the number of words still needed
+    max_coverage = max(popcount(mask) for mask in word_masks)
+    
+    # Two-word completions for each letter, met by the forward search once a
+    # path has exactly two words to go, which makes the last two levels exact
+    suffixes = build_suffix_table(word_masks, word_ends, offsets, successor_words)
+    if suffixes is not None:
+        suffix_reach = [0] * 26
+        for letter_index, table in enumerate(suffixes):
+            for mask in table:
+                suffix_reach[letter_index] |= mask
+    
+    # Largest remaining depth at which each (last letter, used letters) state
+    # already failed. Future moves depend only on those two values, so a
+    # state that failed with more words to spare can be skipped.
+    failed_depths = {}
+    iterations = 0
+    
+    # Depth-first stack of entries packed into one int each (see _ENTRY_*).
+    # An exit entry sits below a state's successors and is popped once they
+    # have all failed.
+    stack = array('Q')
+    path = []
+    
+    # Best-first over starting words: those covering the most letters go first,
+    # so each deepening pass reaches the likeliest solutions early. The sort is
+    # stable, keeping shorter words first among equals.
+    roots = sorted(range(len(word_masks)), key=lambda index: -popcount(word_masks[index]))
+    
+    # Iterative deepening: the first depth with a solution is the shortest
+    for depth in range(3, max_length + 1):
+        for root in roots:
+            stack.append(word_masks[root] | 1 << _ENTRY_LENGTH_SHIFT | root << _ENTRY_WORD_SHIFT)
+            while stack:
+                entry = stack.pop()
+                used_mask = entry & _ENTRY_MASK_BITS
+                length = entry >> _ENTRY_LENGTH_SHIFT & _ENTRY_LENGTH_BITS
+                index = entry >> _ENTRY_WORD_SHIFT
+                last_letter = word_ends[index]
+                depth_left = depth - length
+                
+                if entry & _ENTRY_EXIT_FLAG:
+                    failed_depths[last_letter | (used_mask << 5)] = depth_left
+                    continue
+                
+                del path[length - 1:]
+                path.append(index)
+                
+                remaining = popcount(puzzle_mask & ~used_mask)
+                if remaining == 0:
+                    return path
+                if depth_left * max_coverage < remaining or iterations >= max_iterations:
+                    continue
+                iterations += 1
+                
+                if failed_depths.get(last_letter | (used_mask << 5), -1) >= depth_left:
+                    continue
+                
+                if depth_left == 2 and suffixes is not None:
+                    missing = puzzle_mask & ~used_mask
+                    if not missing & ~suffix_reach[last_letter]:
+                        for mask, pair in suffixes[last_letter].items():
+                            if mask & missing == missing:
+                                path.extend(pair)
+                                return path
+                    failed_depths[last_letter | (used_mask << 5)] = depth_left
+                    continue
+                
+                # Limit the branching factor but consider more words at early depths
+                branch_limit = 25 if length == 1 else 15
+                
+                # Keep the words adding the most new letters; nlargest is stable,
+                # so ties keep the successor order
+                unused_mask = ~used_mask
+                candidates = nlargest(branch_limit,
+                                      successor_words[offsets[last_letter]:offsets[last_letter + 1]],
+                                      key=lambda index: popcount(word_masks[index] & unused_mask))
+                
+                stack.append(entry | _ENTRY_EXIT_FLAG)
+                child_length = (length + 1) << _ENTRY_LENGTH_SHIFT
+                child_coverage = (depth_left - 1) * max_coverage
+                for index in reversed(candidates):
+                    child_mask = used_mask | word_masks[index]
+                    # Children that can't finish in time would be dropped when popped
+                    child_remaining = popcount(puzzle_mask & ~child_mask)
+                    if child_remaining and child_coverage < child_remaining:
+                        continue
+                    stack.append(child_mask | child_length | index << _ENTRY_WORD_SHIFT)
+        if iterations >= max_iterations:
+            break
+    
+    return None
@@ -53,8 +53,10 @@ def main():
         # Parse square
         square = parse_square(args.square)
         
-        # Create solver
-        solver = LetterBoxedSolver(args.wordlist)
+        # Create solver and load the word list once
+        solver = LetterBoxedSolver()
+        with open(args.wordlist, encoding='utf-8') as wordlist_file:
+            solver.set_dictionary(wordlist_file.read().split())
         
         # Find solution
         solution = solver.find_shortest_solution(square)
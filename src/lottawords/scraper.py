@@ -1,37 +1,32 @@
 """
 Web scraper module for NYT Letter Boxed puzzle.
 """
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
-import time
-import os
+import re
 import logging
 from typing import Tuple, List
 
+import orjson
+import requests
+
 logger = logging.getLogger(__name__)
 
+PUZZLE_URL = "https://www.nytimes.com/puzzles/letter-boxed"
+
+# The page inlines the puzzle as a JSON literal: window.gameData = {...}</script>
+GAME_DATA_PATTERN = re.compile(rb'window\.gameData\s*=\s*(\{.*?\})\s*;?\s*</script>', re.DOTALL)
+
 class LetterBoxedScraper:
     """Scraper for NYT Letter Boxed puzzle."""
     
-    def __init__(self):
-        """Initialize scraper with Chrome options."""
-        # Suppress webdriver messages
-        os.environ['WDM_LOG_LEVEL'] = '0'
-        
-        self.options = Options()
-        
-        # Get Chrome binary path from environment or use default
-        chrome_binary = os.getenv('CHROME_BIN', '/usr/bin/chromium')
-        self.options.binary_location = chrome_binary
-        
-        # Add Chrome options from environment or use defaults
-        chrome_options = os.getenv('CHROME_OPTIONS', '--headless --disable-gpu --no-sandbox --disable-dev-shm-usage')
-        for option in chrome_options.split():
-            self.options.add_argument(option)
-            
-        self.options.add_argument('--log-level=3')
-        self.options.add_experimental_option('excludeSwitches', ['enable-logging'])
+    def __init__(self, timeout: float = 10):
+        """Initialize scraper with a session carrying the request headers."""
+        self.timeout = timeout
+        self.headers = {
+            'User-Agent': 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0 Safari/537.36'
+        }
+        # Reuse one connection pool across scrapes instead of a new TLS handshake each time
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
     
     def get_puzzle_data(self) -> Tuple[List[str], List[str], List[str]]:
         """
@@ -43,46 +38,35 @@ class LetterBoxedScraper:
                 - nyt_solution: List of words in NYT's solution
                 - nyt_dictionary: List of valid words according to NYT
         """
-        service = Service(executable_path=os.getenv('SELENIUM_DRIVER_HOST', '/usr/bin/chromedriver'))
-        driver = webdriver.Chrome(service=service, options=self.options)
-        
         try:
             logger.info("Fetching puzzle data from NYT...")
-            driver.get("https://www.nytimes.com/puzzles/letter-boxed")
-            time.sleep(3)
+            response = self.session.get(PUZZLE_URL, timeout=self.timeout)
+            response.raise_for_status()
             
             # Verify gameData exists
-            has_game_data = driver.execute_script("return window.gameData !== undefined")
-            if not has_game_data:
+            match = GAME_DATA_PATTERN.search(response.content)
+            if not match:
                 logger.error("window.gameData not found. The NYT page structure may have changed.")
                 return [], [], []
             
+            game_data = orjson.loads(match.group(1))
+            
             # Get sides, solution, and dictionary
-            sides = driver.execute_script("return window.gameData.sides;")
-            solution = driver.execute_script("return window.gameData.ourSolution;")
+            sides = game_data.get('sides')
+            solution = game_data.get('ourSolution')
             
-            # First check if dictionary property exists
-            has_dictionary = driver.execute_script("return 'dictionary' in window.gameData;")
-            if not has_dictionary:
-                # Try to find another property that might contain the dictionary
-                # Check if 'validWords' exists
-                has_valid_words = driver.execute_script("return 'validWords' in window.gameData;")
-                if has_valid_words:
-                    dictionary = driver.execute_script("return window.gameData.validWords;")
-                else:
-                    # Try other potential properties
-                    game_data_keys = driver.execute_script("return Object.keys(window.gameData);")
-                    for key in game_data_keys:
-                        value_type = driver.execute_script(f"return typeof window.gameData.{key};")
-                        if value_type == 'object':
-                            value_length = driver.execute_script(f"return window.gameData.{key}.length;")
-                            if value_length and value_length > 100:  # Likely a dictionary
-                                dictionary = driver.execute_script(f"return window.gameData.{key};")
-                                break
-                    else:
-                        dictionary = []
+            if 'dictionary' in game_data:
+                dictionary = game_data['dictionary']
+            elif 'validWords' in game_data:
+                dictionary = game_data['validWords']
             else:
-                dictionary = driver.execute_script("return window.gameData.dictionary;")
+                # Try other properties that look like a word list
+                for value in game_data.values():
+                    if isinstance(value, list) and len(value) > 100:  # Likely a dictionary
+                        dictionary = value
+                        break
+                else:
+                    dictionary = []
             
             # Ensure dictionary is a list of strings
             if isinstance(dictionary, list):
@@ -96,10 +80,7 @@ class LetterBoxedScraper:
             
             logger.info(f"Successfully fetched puzzle data with {len(dictionary)} words")
             return sides, solution, dictionary
-            
+        
         except Exception as e:
             logger.error(f"Error fetching puzzle data: {str(e)}")
             raise
-            
-        finally:
-            driver.quit() 
\ No newline at end of file
@@ -1,33 +1,60 @@
 """
 LottaWords solver module for NYT Letter Boxed puzzle.
 """
-from collections import deque
-from typing import Dict, List, Set, Optional, Tuple
+from array import array
+from collections import OrderedDict
+from typing import Dict, Hashable, List, NamedTuple, Set, Optional
 import logging
-import copy
-import os
-import pkg_resources
-import sys
+import threading
+
+from ._solver_core import (
+    build_side_table, build_successor_table, drop_dominated, filter_playable, is_valid_bytes,
+    letter_mask, popcount, search_shortest, side_table_mask
+)
 
 logger = logging.getLogger(__name__)
 
+# How many (square, dictionary) preprocessing results each solver keeps
+PREPROCESS_CACHE_SIZE = 8
+
+
+class _Preprocessed(NamedTuple):
+    """Search inputs derived from one square and dictionary."""
+    playable_words: List[bytes]
+    original_case: Dict[bytes, str]
+    word_masks: array
+    word_ends: bytes
+    offsets: array
+    successor_words: array
+    puzzle_mask: int
+
+
 class LetterBoxedSolver:
     def __init__(self):
         """Initialize solver without a default dictionary."""
         self.word_list = []  # Empty by default
+        self._word_list_version = 0  # Bumped by set_dictionary, keys the preprocessing cache
+        self._preprocessed = OrderedDict()
+        self._preprocessed_lock = threading.Lock()
         logger.info("Initialized solver without default dictionary")
 
-    def _normalize_square(self, square: Dict[str, Set[str]]) -> Dict[str, Set[str]]:
-        """Convert all letters in square to lowercase sets."""
-        normalized = {}
-        for side, letters in square.items():
-            if isinstance(letters, str):
-                # Convert string to set of lowercase letters
-                normalized[side] = {letter.lower() for letter in letters}
-            else:
-                # Convert each letter to lowercase
-                normalized[side] = {letter.lower() for letter in letters}
-        return normalized
+    def set_dictionary(self, words: List[str]) -> None:
+        """
+        Set the default dictionary used when find_shortest_solution gets none.
+        
+        Words are converted to strings once here, and the list gets its own cache
+        key so solving against it never hashes the whole word list.
+        """
+        self.word_list = [str(word) for word in words]
+        self._word_list_version += 1
+        logger.info(f"Loaded dictionary with {len(self.word_list)} words")
+
+    def _prepare_square(self, square: Dict[str, Set[str]]) -> bytes:
+        """
+        Build a 256-entry table mapping each byte to the index (0-3) of the side
+        its letter is on, or 0xFF if the letter is not in the square.
+        """
+        return build_side_table(tuple(tuple(letters) for letters in square.values()))
 
     def is_valid_word(self, word: str, square: Dict[str, Set[str]]) -> bool:
         """
@@ -43,78 +70,52 @@ class LetterBoxedSolver:
         if not word:
             return False
             
-        # Convert to lowercase for comparison
-        word = word.lower() 
-        
-        # Convert square to lowercase for case-insensitive matching
-        normalized_square = {}
-        for side, letters in square.items():
-            normalized_square[side] = {letter.lower() for letter in letters}
-        
-        # Check if all letters are in the square
-        all_letters = set()
-        for side_letters in normalized_square.values():
-            all_letters.update(side_letters)
-            
-        # Check that all word letters are in the square
-        for letter in word:
-            if letter not in all_letters:
-                return False
-        
-        # Find which side each letter belongs to
-        letter_sides = {}
-        for side, letters in normalized_square.items():
-            for letter in letters:
-                letter_sides[letter] = side
-                
-        # Check that consecutive letters are from different sides
-        for i in range(1, len(word)):
-            prev_letter = word[i-1]
-            curr_letter = word[i]
+        try:
+            word_bytes = word.lower().encode('ascii')
+        except UnicodeEncodeError:
+            return False
             
-            if letter_sides[prev_letter] == letter_sides[curr_letter]:
-                return False
-                
-        return True
+        return is_valid_bytes(word_bytes, self._prepare_square(square))
 
     def covers_all_letters(self, used_letters: Set[str], square: Dict[str, Set[str]]) -> bool:
         """Check if all letters in the square have been used."""
-        # Make sure used_letters is lowercase for comparison
-        used_letters = {letter.lower() for letter in used_letters}
-        
-        # Get all letters from the square (lowercase for comparison)
-        all_letters = set()
-        for side, letters in square.items():
-            # Handle both string and set inputs
-            if isinstance(letters, str):
-                all_letters.update(letter.lower() for letter in letters)
-            else:
-                all_letters.update(letter.lower() for letter in letters)
-        
-        # Check if every letter from the puzzle is in the used_letters
-        missing_letters = all_letters - used_letters
-        if missing_letters:
-            return False
-            
-        return True
+        used_mask = self._mask_of(used_letters)
+        puzzle_mask = side_table_mask(self._prepare_square(square))
+        return (puzzle_mask & ~used_mask) == 0
+
+    @staticmethod
+    def _mask_of(letters) -> int:
+        """Letter mask of the a-z letters in some strings, ignoring case and anything else."""
+        letter_bytes = ''.join(letters).lower().encode('ascii', 'ignore')
+        return letter_mask(bytes(byte for byte in letter_bytes if 97 <= byte <= 122))
 
     def word_priority(self, word: str, used_letters: Set[str]) -> int:
         """Calculate priority score for a word based on unused letters it contains."""
-        word_letters = set(word)
-        used_letters = {letter for letter in used_letters}
-        return len(word_letters - used_letters)
+        return popcount(self._mask_of(word) & ~self._mask_of(used_letters))
 
-    def find_shortest_solution(self, square: Dict[str, Set[str]], dictionary: List[str]) -> List[str]:
+    def find_shortest_solution(self, square: Dict[str, Set[str]],
+                               dictionary: Optional[List[str]] = None,
+                               dictionary_key: Optional[str] = None) -> List[str]:
         """
         Find shortest solution that uses all letters.
         
         Args:
             square: Dictionary of sides with their letters
-            dictionary: List of valid words to use (NYT dictionary)
+            dictionary: List of valid words to use (NYT dictionary); defaults to the
+                words given to set_dictionary
+            dictionary_key: Optional cache key for the dictionary, for callers that solve
+                repeatedly against the same word list (e.g. its version or hash)
             
         Returns:
             List of words forming the shortest solution, guaranteed to be a list (may be empty)
         """
+        if dictionary is None:
+            # Already normalized by set_dictionary
+            if not self.word_list:
+                return []
+            return self._search(self._preprocess(square, self.word_list,
+                                                 ('word_list', self._word_list_version)))
+        
         # Ensure all inputs are valid
         if not dictionary or not isinstance(dictionary, list):
             return []  # Return empty list, not None
@@ -125,139 +126,94 @@ class LetterBoxedSolver:
         except Exception as e:
             return []
         
-        # Use normalized square without modifying input
-        normalized_square = self._normalize_square(square)
-        
-        # Get valid words and sort by length (prefer shorter words)
-        playable_words = []
-        original_case = {}  # Map lowercase words to their original case
+        return self._search(self._preprocess(square, word_source, dictionary_key))
+
+    def _preprocess(self, square: Dict[str, Set[str]], dictionary: List[str],
+                    dictionary_key: Optional[Hashable] = None) -> _Preprocessed:
+        """
+        Filter the dictionary for a square and build the search tables, reusing the
+        result of an earlier call with the same square and dictionary.
         
-        for word in word_source:
-            if not word:  # Skip empty strings
-                continue
-                
-            word_lower = word.lower()
-            is_valid = self.is_valid_word(word_lower, normalized_square)
-            
-            if is_valid:
-                playable_words.append(word_lower)
-                original_case[word_lower] = word  # Store original case
+        Args:
+            square: Dictionary of sides with their letters
+            dictionary: List of valid words to use
+            dictionary_key: Identifies the dictionary's contents for the cache; the
+                words themselves are used when omitted
+        """
+        # Build the letter -> side table once for the whole dictionary
+        side_table = self._prepare_square(square)
+        cache_key = (side_table, dictionary_key if dictionary_key is not None else tuple(dictionary))
+        with self._preprocessed_lock:
+            cached = self._preprocessed.get(cache_key)
+            if cached is not None:
+                self._preprocessed.move_to_end(cache_key)
+                return cached
+        
+        # Get valid words as lowercase bytes and sort by length (prefer shorter words)
+        playable_words, original_case = filter_playable(dictionary, side_table)
         
-        if not playable_words:
-            return []  # Return empty list, not None
-            
         # Sort by length and then by number of unique letters
         playable_words.sort(key=lambda w: (len(w), -len(set(w))))
         
-        # Create lookup maps for the search
-        first_letter_map = {}
-        unique_letters_map = {}  # Track unique letters in each word
+        # Only words not covered by a same-endpoint word with more letters
+        # can change which solutions exist
+        playable_words = drop_dominated(playable_words)
         
-        for word in playable_words:
-            if not word:
-                continue
-                
-            # Map for looking up words by first letter
-            first_letter = word[0]
-            if first_letter not in first_letter_map:
-                first_letter_map[first_letter] = []
-            first_letter_map[first_letter].append(word)
-            
-            # Map words to their unique letters (for prioritizing coverage)
-            unique_letters_map[word] = set(word)
+        # Create lookup arrays for the search, with letters as indexes 0-25
+        word_masks = array('I')  # Bitmask of the letters in each playable word
+        word_starts = bytearray()  # First letter of each playable word
+        word_ends = bytearray()  # Last letter of each playable word
         
-        # Get all unique letters in the puzzle for verification
-        all_puzzle_letters = set()
-        for side, letters in square.items():
-            if isinstance(letters, str):
-                all_puzzle_letters.update(letter.lower() for letter in letters)
-            else:
-                all_puzzle_letters.update(letter.lower() for letter in letters)
-        
-        queue: deque = deque()
         for word in playable_words:
-            queue.append(([word], unique_letters_map[word]))
-        
-        visited = set()
-        min_solution = None
-        min_solution_len = float('inf')
+            word_masks.append(letter_mask(word))
+            word_starts.append(word[0] - 97)
+            word_ends.append(word[-1] - 97)
+        
+        # Words grouped by first letter, so shorter words come first on ties
+        offsets, successor_words = build_successor_table(word_starts)
+        
+        preprocessed = _Preprocessed(playable_words, original_case, word_masks, bytes(word_ends),
+                                     offsets, successor_words, side_table_mask(side_table))
+        with self._preprocessed_lock:
+            self._preprocessed[cache_key] = preprocessed
+            if len(self._preprocessed) > PREPROCESS_CACHE_SIZE:
+                self._preprocessed.popitem(last=False)
+        return preprocessed
+
+    def _search(self, preprocessed: _Preprocessed) -> List[str]:
+        """Find the shortest solution over preprocessed search tables."""
+        playable_words = preprocessed.playable_words
+        original_case = preprocessed.original_case
+        word_masks = preprocessed.word_masks
+        if not playable_words:
+            return []  # Return empty list, not None
         
         # Increase search limit for better solutions
         max_solution_length = 5
-        search_iterations = 0
         max_iterations = 100000  # Increased to find better solutions
         
-        while queue and search_iterations < max_iterations:
-            search_iterations += 1
-            
-            current_words, used_letters = queue.popleft()
-            
-            # Skip if we already have a shorter solution
-            if min_solution and len(current_words) >= min_solution_len:
-                continue
-            
-            state = (tuple(current_words), ''.join(sorted(used_letters)))
-            if state in visited:
-                continue
-            visited.add(state)
-            
-            # Check if this solution covers all letters in the puzzle
-            if all_puzzle_letters.issubset(used_letters):
-                # Double-check with the detailed verification
-                if self.covers_all_letters(used_letters, square):
-                    min_solution = current_words
-                    min_solution_len = len(current_words)
-                    # Early exit if we find a 2-word solution
-                    if min_solution_len <= 2:
-                        break
-                continue
-
-            # Only continue search if we haven't reached the maximum solution length
-            if len(current_words) >= max_solution_length:
-                continue
-                
-            # Find next words that can be played
-            last_letter = current_words[-1][-1]
-            
-            # Use the first letter map for more efficient lookup
-            next_words = first_letter_map.get(last_letter, [])
-            
-            # First prioritize by how many new, uncovered letters the word adds
-            prioritized_words = []
-            for word in next_words:
-                new_letters = unique_letters_map[word] - used_letters
-                # Score words higher if they add more unique letters
-                prioritized_words.append((word, len(new_letters)))
-            
-            # Sort by number of new letters, then by word length (shorter preferred)
-            prioritized_words.sort(key=lambda x: (-x[1], len(x[0])))
-            
-            # Limit the branching factor but consider more words at early depths
-            branch_limit = 25 if len(current_words) == 1 else 15
-            
-            for word_info in prioritized_words[:branch_limit]:
-                word = word_info[0]
-                new_words = current_words + [word]
-                new_letters = used_letters | unique_letters_map[word]
-                queue.append((new_words, new_letters))
+        min_solution = search_shortest(word_masks, preprocessed.word_ends, preprocessed.offsets,
+                                       preprocessed.successor_words, preprocessed.puzzle_mask,
+                                       max_solution_length, max_iterations)
         
         # Always return a list, never None
         result = []
         if min_solution:
             # Convert solution back to original case
+            min_solution = [playable_words[index] for index in min_solution]
             try:
                 result = [original_case[word] for word in min_solution]
             except Exception as e:
                 # Fallback to lowercase solution if conversion fails
-                result = min_solution
+                result = [word.decode('ascii') for word in min_solution]
         elif playable_words:
             # If no solution found but we have valid words, return single longest word
             # Sort by unique letter coverage
-            best_words = sorted(playable_words, 
-                               key=lambda w: (len(set(w).intersection(all_puzzle_letters)), -len(w)))
-            if best_words:
-                best_word = best_words[-1]  # Word with most puzzle letter coverage
-                result = [original_case.get(best_word, best_word)]
+            best_indexes = sorted(range(len(playable_words)),
+                                  key=lambda i: (popcount(word_masks[i]), -len(playable_words[i])))
+            if best_indexes:
+                best_word = playable_words[best_indexes[-1]]  # Word with most puzzle letter coverage
+                result = [original_case.get(best_word, best_word.decode('ascii'))]
                 
         # Final validation to ensure we're returning a list of strings
         if not isinstance(result, list):
@@ -0,0 +1,642 @@
+"""
+Flask web application for LottaWords.
+"""
+import os
+import hashlib
+import functools
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+from flask import Blueprint, Flask, Response, render_template, jsonify, request
+from flask.json.provider import DefaultJSONProvider
+from flask_cors import CORS
+from apscheduler.schedulers.background import BackgroundScheduler
+from apscheduler.triggers.cron import CronTrigger
+import atexit
+import logging
+import logging.handlers
+import orjson
+import redis
+
+from .scraper import LetterBoxedScraper
+from .solver import LetterBoxedSolver
+
+# Configure logging
+log_level = os.getenv('LOG_LEVEL', 'INFO')
+logger = logging.getLogger(__name__)
+logger.setLevel(getattr(logging, log_level))
+
+# Create formatter
+formatter = logging.Formatter(
+    '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+
+# Always add console handler
+console_handler = logging.StreamHandler()
+console_handler.setFormatter(formatter)
+logger.addHandler(console_handler)
+
+# Add syslog handler in production
+if os.getenv('FLASK_ENV') == 'production':
+    # If PAPERTRAIL_HOST and PAPERTRAIL_PORT are set, use them
+    papertrail_host = os.getenv('PAPERTRAIL_HOST')
+    papertrail_port = os.getenv('PAPERTRAIL_PORT')
+    
+    if papertrail_host and papertrail_port:
+        syslog_handler = logging.handlers.SysLogHandler(
+            address=(papertrail_host, int(papertrail_port))
+        )
+        syslog_handler.setFormatter(formatter)
+        logger.addHandler(syslog_handler)
+
+# Dumping every request header is noisy, so it needs DEBUG and LOG_HEADERS=1
+LOG_HEADERS = os.getenv('LOG_HEADERS') == '1'
+
+bp = Blueprint('lottawords', __name__)
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider that serializes with orjson"""
+    
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=self.default).decode()
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+# Origins allowed in 'dynamic' CORS mode: exact matches from
+# CORS_ALLOWED_ORIGINS, local dev servers and Vercel/Railway deployments
+_ALLOWED_EXACT = frozenset(
+    origin.strip() for origin in os.getenv('CORS_ALLOWED_ORIGINS', '').split(',') if origin.strip()
+)
+_ALLOWED_SUFFIX = ('.vercel.app', '.railway.app')
+_LOCALHOST = 'http://localhost:'
+
+# CORS headers that are the same for every allowed origin
+_CORS_STATIC = (
+    ('Access-Control-Allow-Methods', 'GET, OPTIONS'),
+    ('Access-Control-Allow-Headers', 'Content-Type, Authorization, Origin'),
+    ('Access-Control-Allow-Credentials', 'true'),
+    ('Access-Control-Max-Age', '3600'),  # Cache preflight for 1 hour
+)
+
+def is_valid_origin(origin):
+    """Check if an Origin header is allowed to receive CORS headers"""
+    return bool(origin) and (
+        origin in _ALLOWED_EXACT or
+        origin.startswith(_LOCALHOST) or
+        origin.endswith(_ALLOWED_SUFFIX)
+    )
+
+def after_request(response):
+    """Add CORS headers to every response"""
+    origin = request.headers.get('Origin')
+    
+    # Responses with and without CORS headers differ by Origin, so caches must key on it
+    response.vary.add('Origin')
+    
+    # Check if origin is allowed
+    if origin:
+        if is_valid_origin(origin):
+            response.headers.update(_CORS_STATIC)
+            response.headers['Access-Control-Allow-Origin'] = origin
+            
+            logger.debug("CORS headers set for origin: %s", origin)
+        else:
+            logger.warning("Rejected origin: %s", origin)
+    
+    return response
+
+def log_request_info():
+    """Log request information for debugging"""
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Request %s %s origin=%s", request.method, request.path, request.headers.get('Origin'))
+        if LOG_HEADERS:
+            logger.debug("Request headers: %s", dict(request.headers))
+
+# NYT publishes the new puzzle at 3:05 AM US/Eastern
+EASTERN = ZoneInfo('US/Eastern')
+
+# Add the memory cache dictionary
+memory_cache = {
+    'body': None,
+    'etag': None,
+    'last_updated_epoch': None
+}
+
+# The response body is stored pre-serialized alongside its ETag
+CACHE_KEY = 'puzzle_data'
+CACHE_BODY_KEY = f'{CACHE_KEY}:body'
+CACHE_ETAG_KEY = f'{CACHE_KEY}:etag'
+CACHE_UPDATED_KEY = f'{CACHE_KEY}:last_updated_epoch'
+
+# Share one bounded connection pool between all request threads
+try:
+    redis_url = os.getenv('REDIS_URL', 'redis://localhost:6379')
+    redis_pool = redis.BlockingConnectionPool.from_url(
+        redis_url,
+        max_connections=int(os.getenv('REDIS_POOL_SIZE', '16')),
+        timeout=2,
+        socket_timeout=2,
+        health_check_interval=30
+    )
+    redis_client = redis.Redis(connection_pool=redis_pool)
+    atexit.register(redis_pool.disconnect)
+    USING_REDIS = True
+except:
+    logger.warning("Redis connection failed, falling back to memory cache")
+    USING_REDIS = False
+
+# Only one worker may scrape at a time; the lock expires if its holder dies
+SCRAPE_LOCK_KEY = 'puzzle:scrape_lock'
+SCRAPE_LOCK_TIMEOUT = 120
+
+# Delete the lock only if it is still held with our token
+RELEASE_LOCK_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+def acquire_scrape_lock():
+    """Try to take the scrape lock, returning its token or None if it is held"""
+    token = uuid.uuid4().hex
+    if not USING_REDIS:
+        return token
+    try:
+        if redis_client.set(SCRAPE_LOCK_KEY, token, nx=True, ex=SCRAPE_LOCK_TIMEOUT):
+            return token
+        return None
+    except Exception as e:
+        # Without Redis there is nothing to coordinate with, so go ahead
+        logger.warning(f"Could not acquire scrape lock: {e}")
+        return token
+
+def release_scrape_lock(token):
+    """Release the scrape lock if we still hold it"""
+    if not USING_REDIS:
+        return
+    try:
+        redis_client.eval(RELEASE_LOCK_SCRIPT, 1, SCRAPE_LOCK_KEY, token)
+    except Exception as e:
+        logger.warning(f"Could not release scrape lock: {e}")
+
+# Process-local copy of the cache entry for the current puzzle day
+_local_cache = {
+    'cutoff': None,
+    'entry': None
+}
+
+# Minutes after midnight of the daily puzzle update (3:05 AM)
+_UPDATE_MINUTE = 3 * 60 + 5
+_ONE_DAY = timedelta(days=1)
+_ZERO = timedelta(0)
+
+@functools.lru_cache(maxsize=2)
+def _cutoff_for(date_key):
+    """Compute the unix time of the last puzzle update for a (year, month, day, before_update) key"""
+    year, month, day, before_update = date_key
+    cutoff_time = datetime(year, month, day, hour=3, minute=5, tzinfo=EASTERN) - (_ONE_DAY if before_update else _ZERO)
+    return int(cutoff_time.timestamp())
+
+def _current_cutoff():
+    """Get the unix time of the last puzzle update (3:05 AM EST)"""
+    now = datetime.now(EASTERN)
+    before_update = now.hour * 60 + now.minute < _UPDATE_MINUTE
+    return _cutoff_for((now.year, now.month, now.day, before_update))
+
+def _is_after_cutoff(last_updated_epoch):
+    """Check if a unix timestamp is after the last puzzle update"""
+    return last_updated_epoch >= _current_cutoff()
+
+def fetch_cache_once():
+    """Read the cache in a single round-trip, returning (entry, is_valid)
+    
+    entry is a dict with the serialized 'body', its 'etag' and its
+    'last_updated_epoch', or None.
+    """
+    try:
+        if USING_REDIS:
+            body, etag, last_updated_epoch = redis_client.mget(
+                CACHE_BODY_KEY, CACHE_ETAG_KEY, CACHE_UPDATED_KEY
+            )
+            if not body or not etag:
+                return None, False
+            etag = etag.decode()
+            last_updated_epoch = int(last_updated_epoch) if last_updated_epoch else 0
+        else:
+            if not memory_cache['body']:
+                return None, False
+            body = memory_cache['body']
+            etag = memory_cache['etag']
+            last_updated_epoch = memory_cache['last_updated_epoch'] or 0
+        
+        try:
+            is_valid = _is_after_cutoff(last_updated_epoch)
+        except Exception as e:
+            logger.error(f"Error checking cache validity: {e}")
+            is_valid = False
+        return {'body': body, 'etag': etag, 'last_updated_epoch': last_updated_epoch}, is_valid
+    except Exception as e:
+        logger.error(f"Error reading cache: {e}")
+        return None, False
+
+def is_cache_valid():
+    """Check if cache is valid (from today and after the last puzzle update)"""
+    return fetch_cache_once()[1]
+
+def get_cached_data():
+    """Get cached puzzle data"""
+    entry = fetch_cache_once()[0]
+    return orjson.loads(entry['body']) if entry else None
+
+def save_cache_data(data):
+    """Save puzzle data to cache as a pre-serialized response body"""
+    try:
+        body = orjson.dumps(data)
+        etag = hashlib.blake2b(body, digest_size=16).hexdigest()
+        last_updated_epoch = int(time.time())
+        if USING_REDIS:
+            pipe = redis_client.pipeline()
+            pipe.set(CACHE_BODY_KEY, body)
+            pipe.set(CACHE_ETAG_KEY, etag)
+            pipe.set(CACHE_UPDATED_KEY, last_updated_epoch)
+            pipe.execute()
+        else:
+            memory_cache['body'] = body
+            memory_cache['etag'] = etag
+            memory_cache['last_updated_epoch'] = last_updated_epoch
+        logger.info(f"Cache saved to {'Redis' if USING_REDIS else 'memory'}")
+    except Exception as e:
+        logger.error(f"Error saving cache: {e}")
+
+def cached_response(entry):
+    """Build the /api/puzzle response for a cache entry
+    
+    Clients revalidating with If-None-Match or If-Modified-Since get an
+    empty 304 while the puzzle hasn't changed.
+    """
+    response = Response(entry['body'], mimetype='application/json')
+    response.set_etag(entry['etag'])
+    response.last_modified = entry['last_updated_epoch']
+    response.headers['Cache-Control'] = 'public, max-age=60, must-revalidate'
+    # Shared caches must not serve a copy without CORS headers to a CORS request
+    response.vary.add('Origin')
+    return response.make_conditional(request)
+
+# Scraper and solver are shared by all requests and created on first use
+_scraper = None
+_solver = None
+_init_lock = threading.Lock()
+
+def get_scraper():
+    """Get the process-wide LetterBoxedScraper"""
+    global _scraper
+    if _scraper is None:
+        with _init_lock:
+            if _scraper is None:
+                _scraper = LetterBoxedScraper()
+    return _scraper
+
+def get_solver():
+    """Get the process-wide LetterBoxedSolver"""
+    global _solver
+    if _solver is None:
+        with _init_lock:
+            if _solver is None:
+                _solver = LetterBoxedSolver()
+    return _solver
+
+def fetch_puzzle_data():
+    """Fetch fresh puzzle data from NYT and solve it"""
+    lock_token = acquire_scrape_lock()
+    if not lock_token:
+        logger.info("Another worker is already fetching puzzle data")
+        return {
+            'status': 'loading',
+            'message': 'Data is being prepared, please try again in a moment'
+        }
+    
+    try:
+        logger.info("Fetching new puzzle data...")
+        scraper = get_scraper()
+        sides, nyt_solution, nyt_dictionary = scraper.get_puzzle_data()
+        
+        # Make sure we have valid sides data
+        if not sides or len(sides) != 4:
+            logger.error("Invalid or missing sides data from NYT")
+            return {'error': 'Failed to retrieve puzzle data from NYT: Invalid sides data'}
+        
+        # Format sides into a square dictionary as expected by find_shortest_solution
+        square = {
+            "top": sides[0],
+            "right": sides[1],
+            "bottom": sides[2],
+            "left": sides[3]
+        }
+        
+        # Check if we have a valid dictionary from NYT
+        if not nyt_dictionary or len(nyt_dictionary) == 0:
+            logger.error("No dictionary received from NYT")
+            return {'error': 'Failed to retrieve dictionary from NYT website. The page structure may have changed or the site may be temporarily unavailable.'}
+        
+        solver = get_solver()
+        # Use the NYT dictionary
+        lotta_solution = solver.find_shortest_solution(square, nyt_dictionary)
+        
+        # Ensure nyt_solution is a list of strings
+        if not nyt_solution or not isinstance(nyt_solution, list):
+            nyt_solution = []
+        else:
+            # Convert all items to strings if needed
+            nyt_solution = [str(word) for word in nyt_solution]
+        
+        # Format for consistent response
+        formatted_data = {
+            'square': {
+                'top': sides[0],
+                'right': sides[1],
+                'bottom': sides[2],
+                'left': sides[3]
+            },
+            'nyt_solution': nyt_solution,
+            'lotta_solution': lotta_solution,
+            'error': None
+        }
+        
+        # Save to Redis
+        save_cache_data(formatted_data)
+        
+        # Drop the process-local copy so the next request picks up the new data
+        _local_cache['cutoff'] = None
+        _local_cache['entry'] = None
+        
+        logger.info("Puzzle data updated successfully")
+        return formatted_data
+    except Exception as e:
+        logger.error(f"Error fetching puzzle data: {e}")
+        return {'error': str(e)}
+    finally:
+        release_scrape_lock(lock_token)
+
+def _get_cache_entry():
+    """Get today's cache entry, or None if the cache is stale or missing"""
+    # Serve from the process-local cache while the puzzle hasn't changed
+    cutoff = _current_cutoff()
+    if _local_cache['cutoff'] == cutoff and _local_cache['entry']:
+        return _local_cache['entry']
+    
+    # Check for valid cache
+    entry, is_valid = fetch_cache_once()
+    if is_valid:
+        logger.info("Using valid cache data")
+        _local_cache['cutoff'] = cutoff
+        _local_cache['entry'] = entry
+        return entry
+    return None
+
+# Set while a request thread in this process is fetching fresh data
+_scraping = False
+_scraping_lock = threading.Lock()
+
+def _fetch_fresh_payload():
+    """Fetch fresh puzzle data, or report that a fetch is already running"""
+    global _scraping
+    
+    # Check if scraping is already in progress
+    with _scraping_lock:
+        if _scraping:
+            logger.info("Scraping already in progress, returning status")
+            return {
+                'status': 'loading',
+                'message': 'Data is being prepared, please try again in a moment'
+            }
+        
+        # If we're here, we need fresh data and no scraping is happening
+        _scraping = True
+    
+    try:
+        logger.info("Starting fresh data fetch")
+        return fetch_puzzle_data()
+    except Exception as e:
+        logger.error(f"Error during fetch: {e}")
+        return {
+            'status': 'error',
+            'message': str(e)
+        }
+    finally:
+        with _scraping_lock:
+            _scraping = False
+
+def _compute_puzzle_payload():
+    """Get today's puzzle data as a dict (from cache if available)"""
+    entry = _get_cache_entry()
+    if entry:
+        return orjson.loads(entry['body'])
+    return _fetch_fresh_payload()
+
+@bp.route('/api/puzzle')
+def get_puzzle_data():
+    """API endpoint to get puzzle data (from cache if available)"""
+    entry = _get_cache_entry()
+    if entry:
+        return cached_response(entry)
+    return jsonify(_fetch_fresh_payload())
+
+# Health probes hit these every few seconds, so their bodies are prebuilt
+# and only the timestamp is spliced in. Responses themselves can't be shared
+# because after_request adds per-origin CORS headers to them.
+_STATUS_PREFIX = b'{"status":"healthy","timestamp":"'
+_STATUS_SUFFIXES = {
+    (redis_connected, cache_valid): (
+        f'","redis_connected":{orjson.dumps(redis_connected).decode()},'
+        f'"cache_valid":{orjson.dumps(cache_valid).decode()}}}'
+    ).encode()
+    for redis_connected in (False, True)
+    for cache_valid in (False, True)
+}
+_INTERNAL_ERROR_BODY = orjson.dumps({'status': 'error', 'message': 'Internal server error'})
+
+@bp.route('/api/status')
+def get_status():
+    """Health check endpoint"""
+    try:
+        timestamp = datetime.now().isoformat()
+        redis_connected = False
+        cache_valid = False
+        
+        # Check Redis connection
+        try:
+            redis_client.ping()
+            redis_connected = True
+        except:
+            logger.warning("Redis connection failed")
+        
+        # Check cache if Redis is connected
+        if redis_connected:
+            try:
+                cache_valid = is_cache_valid()
+            except:
+                logger.warning("Cache validation failed")
+        
+        body = _STATUS_PREFIX + timestamp.encode() + _STATUS_SUFFIXES[(redis_connected, bool(cache_valid))]
+        return Response(body, mimetype='application/json')
+    except Exception as e:
+        logger.error(f"Status check failed: {str(e)}")
+        return jsonify({
+            'status': 'error',
+            'message': 'Internal status check failed',
+            'timestamp': datetime.now().isoformat()
+        }), 200  # Return 200 even on error for health check
+
+@bp.route('/api/healthz')
+def healthz():
+    """Minimal health check endpoint for Railway"""
+    logger.debug("Health check endpoint called")
+    return Response(b'OK', mimetype='text/plain')
+
+@bp.route('/api/health')
+def health_check():
+    """Health check endpoint."""
+    body = _STATUS_PREFIX + datetime.utcnow().isoformat().encode() + b'"}'
+    return Response(body, mimetype='application/json')
+
+def handle_500_error(e):
+    logger.error(f"Internal server error: {str(e)}")
+    return Response(_INTERNAL_ERROR_BODY, status=500, mimetype='application/json')
+
+def handle_exception(e):
+    logger.error(f"Unhandled exception: {str(e)}")
+    return Response(_INTERNAL_ERROR_BODY, status=500, mimetype='application/json')
+
+@bp.route('/api/debug')
+def debug_puzzle_data():
+    """Debug endpoint to check puzzle data and response format"""
+    try:
+        # Scrape fresh data
+        logger.info("DEBUG: Fetching fresh data for debugging")
+        scraper = get_scraper()
+        sides, nyt_solution, nyt_dictionary = scraper.get_puzzle_data()
+        
+        # Check formats
+        response = {
+            "sides_type": str(type(sides)),
+            "sides_value": sides,
+            "nyt_solution_type": str(type(nyt_solution)),
+            "nyt_solution_value": nyt_solution,
+            "dictionary_type": str(type(nyt_dictionary)),
+            "dictionary_length": len(nyt_dictionary) if nyt_dictionary else 0,
+            "sample_words": nyt_dictionary[:5] if nyt_dictionary and len(nyt_dictionary) >= 5 else []
+        }
+        
+        # Check cache
+        entry, is_valid = fetch_cache_once()
+        if is_valid:
+            lotta_solution = orjson.loads(entry['body']).get('lotta_solution')
+            response["cache_status"] = "valid"
+            response["cached_data"] = {
+                "lotta_solution": lotta_solution,
+                "lotta_solution_type": str(type(lotta_solution)),
+                "lotta_solution_length": len(lotta_solution) if lotta_solution else 0
+            }
+        else:
+            response["cache_status"] = "invalid or missing"
+        
+        return jsonify(response)
+    except Exception as e:
+        logger.error(f"Error in debug endpoint: {e}")
+        return jsonify({"error": str(e)})
+
+def warm_cache():
+    """Fetch puzzle data if the cache doesn't already hold today's puzzle"""
+    if not is_cache_valid():
+        fetch_puzzle_data()
+
+def init_scheduler():
+    """Initialize the scheduler to update puzzle data at 3:05 AM EST (when NYT updates)"""
+    scheduler = BackgroundScheduler()
+    
+    # Schedule job to run at 3:05 AM EST every day
+    scheduler.add_job(
+        fetch_puzzle_data,
+        CronTrigger(
+            hour=3, 
+            minute=5, 
+            timezone=EASTERN
+        ),
+        id='fetch_daily_puzzle'
+    )
+    
+    scheduler.start()
+    logger.info("Scheduler started - puzzle will update daily at 3:05 AM EST")
+    
+    # Warm the cache in the background so startup isn't blocked on a scrape
+    scheduler.add_job(
+        warm_cache,
+        'date',
+        run_date=datetime.now() + timedelta(seconds=2),
+        id='warmup',
+        misfire_grace_time=300
+    )
+    
+    # Shutdown scheduler when app exits
+    atexit.register(lambda: scheduler.shutdown())
+
+@bp.route('/')
+def index():
+    """Fallback route for the old template"""
+    data = _compute_puzzle_payload()
+    square = data.get('square') or {}
+    return render_template('index.html', 
+                         sides=list(square.values()),
+                         nyt_solution=data.get('nyt_solution') or [],
+                         lotta_solution=data.get('lotta_solution') or [])
+
+def create_app(cors_mode='dynamic'):
+    """
+    Create the LottaWords Flask application.
+    
+    Args:
+        cors_mode: 'dynamic' only echoes allow-listed origins back in the CORS
+            headers, 'wildcard' allows every origin
+    """
+    if cors_mode not in ('dynamic', 'wildcard'):
+        raise ValueError(f"Unknown CORS mode: {cors_mode}")
+    
+    app = Flask(__name__)
+    app.json = OrjsonProvider(app)
+    
+    # Configure CORS
+    if cors_mode == 'wildcard':
+        CORS(app)
+    else:
+        CORS(app, resources={
+            r"/*": {
+                "origins": "*",  # Allow all origins initially, we'll filter in after_request
+                "methods": ["GET", "OPTIONS"],
+                "allow_headers": ["Content-Type", "Authorization", "Origin"],
+                "expose_headers": ["Content-Type", "Authorization"],
+                "supports_credentials": True,
+                "send_wildcard": False  # Required when supports_credentials is True
+            }
+        })
+        app.after_request(after_request)
+    
+    app.before_request(log_request_info)
+    app.register_blueprint(bp)
+    app.register_error_handler(500, handle_500_error)
+    app.register_error_handler(Exception, handle_exception)
+    
+    # On startup: initialize scheduler
+    init_scheduler()
+    
+    # Add startup logging
+    logger.info("Flask application starting")
+    logger.info(f"Environment: {os.getenv('FLASK_ENV', 'development')}")
+    logger.info(f"CORS mode: {cors_mode}")
+    logger.info(f"Redis URL configured: {'REDIS_URL' in os.environ}")
+    logger.info(f"Debug mode: {app.debug}")
+    
+    return app
@@ -22,10 +22,9 @@ echo "Installed Python packages:"
 pip list
 
 echo "Starting gunicorn..."
-# Start gunicorn with minimal configuration
+# Start gunicorn; workers, threads and preloading come from gunicorn.conf.py
 exec gunicorn app:app \
     --bind "0.0.0.0:$PORT" \
-    --workers 1 \
     --timeout 30 \
     --log-level debug \
     --error-logfile - \
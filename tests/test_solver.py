@@ -0,0 +1,123 @@
+"""
+Tests for the Letter Boxed solver.
+"""
+from collections import deque
+
+import pytest
+
+from lottawords._solver_core import _filter_playable_words, build_side_table, filter_playable
+from lottawords.solver import LetterBoxedSolver
+
+WORDS = [
+    'mirid', 'wold', 'fuel', 'ref', 'tower', 'eldred', 'demiwolf', 'toto', 'mould', 'write',
+    'mimeo', 'lot', 'toup', 'witlet', 'wowt', 'tremetol', 'ridered', 'impolite', 'garnel',
+    'sora', 'chronos', 'roseate', 'longshore', 'actinine', 'teleia', 'ashine', 'clone',
+    'shiloh', 'arcate', 'honorer', 'ahong', 'griece', 'reasoner', 'sho', 'titling', 'lohar',
+    'tacana', 'oronoco', 'nonelect', 'tarasco', 'reprotect', 'papistic', 'cisalpine',
+    'mormon', 'canoeman', 'anaclisis', 'clamer', 'placater', 'ericetal', 'lancet',
+    'sinonism', 'palpacle', 'scena', 'marcan',
+]
+
+SQUARES = [
+    ('WML', 'FRO', 'EIP', 'TUD'),
+    ('HGE', 'ANL', 'OCI', 'TRS'),
+    ('RNT', 'AEI', 'SLO', 'CMP'),
+]
+
+# Sides abc / def / ghi / jkl, with made-up words so each answer length is forced
+ALPHABET_SQUARE = ('abc', 'def', 'ghi', 'jkl')
+
+
+def to_square(sides):
+    return {name: letters for name, letters in zip(('top', 'right', 'bottom', 'left'), sides)}
+
+
+def side_of(sides):
+    return {letter.lower(): index for index, letters in enumerate(sides) for letter in letters}
+
+
+def is_playable(word, sides):
+    sides_by_letter = side_of(sides)
+    word = word.lower()
+    if not word or any(letter not in sides_by_letter for letter in word):
+        return False
+    return all(sides_by_letter[a] != sides_by_letter[b] for a, b in zip(word, word[1:]))
+
+
+def shortest_length(sides, words, max_length=5):
+    """Fewest words covering the square, by BFS over (last letter, letters used)."""
+    puzzle_letters = frozenset(side_of(sides))
+    playable = {word.lower() for word in words if is_playable(word, sides)}
+    queue = deque((word[-1], frozenset(word), 1) for word in sorted(playable))
+    seen = set()
+    while queue:
+        last, used, length = queue.popleft()
+        if used == puzzle_letters:
+            return length
+        if (last, used) in seen or length >= max_length:
+            continue
+        seen.add((last, used))
+        for word in playable:
+            if word[0] == last:
+                queue.append((word[-1], used | frozenset(word), length + 1))
+    return None
+
+
+def assert_valid_chain(solution, sides):
+    assert all(is_playable(word, sides) for word in solution)
+    assert all(a[-1].lower() == b[0].lower() for a, b in zip(solution, solution[1:]))
+
+
+@pytest.mark.parametrize('sides', SQUARES)
+def test_solution_length_matches_exhaustive_search(sides):
+    solution = LetterBoxedSolver().find_shortest_solution(to_square(sides), WORDS)
+    expected = shortest_length(sides, WORDS)
+    
+    assert expected is not None
+    assert_valid_chain(solution, sides)
+    assert set(''.join(solution).lower()) == set(side_of(sides))
+    assert len(solution) == expected
+
+
+@pytest.mark.parametrize('words, expected', [
+    (['adg', 'adgjbehkcfil', 'jbe'], ['adgjbehkcfil']),
+    (['adg', 'adgjbeh', 'hkcfil', 'hkc'], ['adgjbeh', 'hkcfil']),
+    # No two of these cover the square, so the last two come from the suffix table
+    (['adgj', 'jbeh', 'hkcfil', 'hkc', 'jbe'], ['adgj', 'jbeh', 'hkcfil']),
+])
+def test_forced_answer_lengths(words, expected):
+    solution = LetterBoxedSolver().find_shortest_solution(to_square(ALPHABET_SQUARE), words)
+    
+    assert solution == expected
+    assert shortest_length(ALPHABET_SQUARE, words) == len(expected)
+
+
+def test_no_solution_returns_best_single_word():
+    words = ['adg', 'gjbeh', 'hkc']
+    solution = LetterBoxedSolver().find_shortest_solution(to_square(ALPHABET_SQUARE), words)
+    
+    assert shortest_length(ALPHABET_SQUARE, words) is None
+    assert solution == ['gjbeh']
+
+
+def test_preprocessing_cache_returns_same_solution():
+    solver = LetterBoxedSolver()
+    square = to_square(SQUARES[0])
+    
+    first = solver.find_shortest_solution(square, WORDS)
+    assert solver.find_shortest_solution(square, WORDS) == first
+    
+    solver.set_dictionary(WORDS)
+    assert solver.find_shortest_solution(square) == first
+
+
+@pytest.mark.parametrize('sides', SQUARES + [ALPHABET_SQUARE])
+def test_filter_playable_matches_word_by_word_filter(sides):
+    words = WORDS + [word.upper() for word in WORDS[::3]] + [
+        '', 'Tower', 'été', 'to-we', 'tow3r', 'adgjbeh', 'ADGJ', 'ab',
+    ]
+    side_table = build_side_table(tuple(tuple(letters) for letters in sides))
+    
+    assert filter_playable(words, side_table) == _filter_playable_words(words, side_table)
+    # A word spanning lines makes filter_playable fall back to the word-by-word filter
+    assert filter_playable(words + ['tow\ner'], side_table) == _filter_playable_words(words, side_table)